@@ -4,15 +4,21 @@ MultiPing - A tool for simultaneously pinging multiple IP addresses and monitori
 """
 
 import argparse
+import array
+import atexit
+import collections
+import concurrent.futures
+import ipaddress
+import selectors
+import shutil
+import struct
 import subprocess
 import threading
 import time
 import os
-import re
 import socket
 import signal
 import sys
-from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 import stat
 import curses
@@ -45,34 +51,133 @@ except ImportError:
     # Print a helpful message about colorama
     print("Note: For colored output, install colorama: pip install colorama")
 
+# Colored status tokens, built once instead of on every refresh
+STATUS_TOKENS = {
+    'up': f"{Fore.GREEN}{'UP':<8}{Style.RESET_ALL}",
+    'down': f"{Fore.RED}{'DOWN':<8}{Style.RESET_ALL}",
+    'error': f"{Fore.YELLOW}{'ERROR':<8}{Style.RESET_ALL}",
+    'unknown': f"{Fore.WHITE}{'WAITING':<8}{Style.RESET_ALL}"
+}
+CHECK_TOKENS = {
+    'up': f"{Fore.GREEN}✓{Style.RESET_ALL}",
+    'down': f"{Fore.RED}✗{Style.RESET_ALL}",
+    'error': f"{Fore.YELLOW}?{Style.RESET_ALL}",
+    'unknown': f"{Fore.YELLOW}?{Style.RESET_ALL}"
+}
+
+# Try to import a file watcher for the devices file, fallback to checking its modification time if not available
+try:
+    from inotify_simple import INotify, flags as inotify_flags  # Linux
+    HAS_INOTIFY = True
+except ImportError:
+    HAS_INOTIFY = False
+
+try:
+    import fsevents  # macOS
+    HAS_FSEVENTS = True
+except ImportError:
+    HAS_FSEVENTS = False
+
 # Global variables
 hosts = []
 host_names = {}  # Dictionary to store custom names for hosts
 results = {}
-running = True
+status_counts = collections.Counter()  # Status -> number of hosts in it, kept in step with results
+_results_lock = threading.RLock()  # Guards results and status_counts, which several threads write
+stop_event = threading.Event()  # Set to stop the worker and display loops
+new_cycle = threading.Condition()  # Notified when the worker finishes a ping cycle or stopping is requested
+_cycle_count = 0  # Ping cycles completed so far, guarded by new_cycle
 refresh_rate = 1.0  # Default refresh rate in seconds
 ping_timeout = 1.0  # Default ping timeout in seconds
 show_timestamp = False
 display_mode = "simple"  # Default display mode (simple, detailed, curses)
 ping_count = 1  # Default ping count per cycle
 devices_file = None  # Path to the devices file
-last_file_mtime = 0  # Last modification time of devices file
+last_file_mtime_ns = 0  # Last modification time of devices file in nanoseconds
+_last_file_check = 0  # When the devices file modification time was last checked
+file_watcher_active = False  # Whether a file watcher is reporting devices file changes
+devices_file_changed = threading.Event()  # Set by the file watcher when the devices file changes
+
+# DNS cache: host -> (ip, expiry time)
+DNS_CACHE_TTL = 300  # Seconds before a resolved hostname is looked up again
+DNS_FAILURE_TTL = 30  # Seconds before a hostname that failed to resolve is tried again
+_dns_cache: Dict[str, Tuple[Optional[str], float]] = {}
+
+# Display data derived from the hosts list, rebuilt only when the list changes
+_sorted_hosts: List[str] = []
+_display_names: Dict[str, str] = {}  # Host -> name truncated to fit the name column
+
+NAME_WIDTH = 15  # Width of the name column in live and curses modes
 
 # Curses-related globals
+KEY_POLL_INTERVAL = 0.1  # Longest curses mode waits between checks for key presses
 stdscr = None
 curses_lock = threading.Lock()
+_curses_status = {}  # Status -> (display text, color), set up by init_curses
+_row_fmt = None  # Device row formatter, rebuilt when the screen is resized
+_row_width = 0  # Longest row that fits on screen
+
+# ICMP constants
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_PAYLOAD = b'MultiPing'.ljust(56, b'\x00')  # Same payload size as the system ping
+
+# Try to open a single ICMP socket shared by all hosts, fallback to the system ping command if not available
+icmp_raw = False
+try:
+    # Unprivileged ICMP socket (macOS, Linux with net.ipv4.ping_group_range)
+    icmp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+except OSError:
+    try:
+        # Raw ICMP socket (requires root)
+        icmp_sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        icmp_raw = True
+    except OSError:
+        icmp_sock = None
+
+if icmp_sock:
+    icmp_sock.setblocking(False)
+
+icmp_ident = os.getpid() & 0xFFFF
+icmp_seq = 0
+
+# Persistent ping processes (host -> process), used when the ICMP socket is not available
+_ping_processes: Dict[str, subprocess.Popen] = {}
+
+# A single fping process pinging every host, preferred over the persistent ping processes when installed
+FPING = shutil.which('fping')
+_fping_process: Optional[subprocess.Popen] = None
+_fping_hosts: Dict[str, List[str]] = {}  # IP -> hosts the running fping process is pinging it for
+
+_LATENCY_CHARS = b'0123456789.'  # Characters of a reply time in the system ping output
 
 def ip_to_int(ip):
     """Convert IP address to integer for sorting"""
+    # Same check resolve() uses, so shorthand like '10.1' that inet_aton accepts sorts as a hostname
     try:
-        # Only attempt conversion for strings that look like IP addresses
-        if all(c.isdigit() or c == '.' for c in ip) and ip.count('.') == 3:
-            parts = list(map(int, ip.split('.')))
-            return (parts[0] << 24) + (parts[1] << 16) + (parts[2] << 8) + parts[3]
-    except:
-        pass
-    # Return a large number for non-IP addresses so they appear at the end
-    return float('inf')
+        return int(ipaddress.IPv4Address(ip))
+    except ValueError:
+        # Return a large number for non-IP addresses so they appear at the end
+        return float('inf')
+
+def truncate_name(name: str) -> str:
+    """Shorten a name to fit the name column"""
+    if len(name) > NAME_WIDTH - 1:
+        return name[:NAME_WIDTH - 4] + "..."
+    return name
+
+def hosts_changed():
+    """Record that the hosts list has changed so cached display data gets rebuilt"""
+    global _sorted_hosts, _display_names
+    
+    # Build the new names and order up front and swap them in whole, so the display
+    # thread only ever sees a complete set
+    _display_names = {host: truncate_name(host_names.get(host, host)) for host in hosts}
+    _sorted_hosts = sorted(hosts, key=ip_to_int)
+
+def get_sorted_hosts() -> List[str]:
+    """Return the hosts sorted by IP address, as of the last hosts list change"""
+    return _sorted_hosts
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -98,44 +203,92 @@ def parse_arguments():
 
 def check_file_changes():
     """Check if the devices file has been modified and reload if necessary"""
-    global hosts, host_names, last_file_mtime
+    global last_file_mtime_ns, _last_file_check
+    
+    # Only check the file once per second at most
+    now = time.monotonic()
+    if now - _last_file_check < 1.0:
+        return
+    _last_file_check = now
     
-    if not devices_file or not os.path.exists(devices_file):
+    if not devices_file:
         return
     
     try:
-        # Get current modification time
-        current_mtime = os.path.getmtime(devices_file)
-        
-        # If file has been modified, reload it
-        if current_mtime > last_file_mtime:
-            last_file_mtime = current_mtime
-            new_hosts, new_host_names = read_hosts_from_file(devices_file)
-            
-            # Only update if the content has actually changed
-            if new_hosts != hosts or new_host_names != host_names:
-                hosts = new_hosts
-                host_names = new_host_names
-                
-                # Clear old results for devices that no longer exist
-                old_hosts = set(results.keys())
-                new_hosts_set = set(hosts)
-                removed_hosts = old_hosts - new_hosts_set
-                
-                for host in removed_hosts:
-                    del results[host]
-                
-                # Print a subtle notification about the update (will be overwritten by next display)
-                print(f"🔄 Updated: {len(hosts)} devices", end='')
-                if removed_hosts:
-                    print(f" (-{len(removed_hosts)})", end='')
-                if added_hosts:
-                    print(f" (+{len(added_hosts)})", end='')
-                print()  # New line
-                
-    except (OSError, IOError):
+        # Get current modification time (a single stat call, in integer nanoseconds)
+        st = os.stat(devices_file)
+    except OSError:
         # File might be temporarily unavailable, ignore
-        pass
+        return
+    
+    # If file has been modified, reload it
+    if st.st_mtime_ns > last_file_mtime_ns:
+        last_file_mtime_ns = st.st_mtime_ns
+        reload_devices_file()
+
+def reload_devices_file():
+    """Reload the devices file and update the hosts if its content has changed"""
+    global hosts, host_names
+    
+    new_hosts, new_host_names = read_hosts_from_file(devices_file)
+    
+    # Only update if the content has actually changed
+    if new_hosts != hosts or new_host_names != host_names:
+        hosts = new_hosts
+        host_names = new_host_names
+        hosts_changed()
+        
+        # Clear old results for devices that no longer exist
+        old_hosts = set(results.keys())
+        new_hosts_set = set(hosts)
+        removed_hosts = old_hosts - new_hosts_set
+        added_hosts = new_hosts_set - old_hosts
+        
+        for host in removed_hosts:
+            remove_result(host)
+        
+        # Print a subtle notification about the update (will be overwritten by next display)
+        print(f"🔄 Updated: {len(hosts)} devices", end='')
+        if removed_hosts:
+            print(f" (-{len(removed_hosts)})", end='')
+        if added_hosts:
+            print(f" (+{len(added_hosts)})", end='')
+        print()  # New line
+
+def start_file_watcher() -> bool:
+    """Watch the devices file from a background thread, returns False if no file watcher is available"""
+    directory = os.path.dirname(os.path.abspath(devices_file))
+    filename = os.path.basename(devices_file)
+    
+    if HAS_INOTIFY:
+        try:
+            inotify = INotify()
+            # Watch the directory so editors that save by renaming a new file into place are noticed too
+            inotify.add_watch(directory, inotify_flags.MODIFY | inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+        except OSError:
+            return False
+        
+        def watch():
+            while not stop_event.is_set():
+                for event in inotify.read(timeout=1000):
+                    if event.name == filename:
+                        devices_file_changed.set()
+        
+        threading.Thread(target=watch, daemon=True).start()
+        return True
+    
+    if HAS_FSEVENTS:
+        def callback(event):
+            if os.path.basename(event.name) == filename:
+                devices_file_changed.set()
+        
+        observer = fsevents.Observer()
+        observer.daemon = True
+        observer.schedule(fsevents.Stream(callback, directory, file_events=True))
+        observer.start()
+        return True
+    
+    return False
 
 def read_hosts_from_file(filename: str) -> Tuple[List[str], Dict[str, str]]:
     """Read hosts from file, one per line with optional name using format 'name:host'"""
@@ -169,93 +322,588 @@ def read_hosts_from_file(filename: str) -> Tuple[List[str], Dict[str, str]]:
     
     return hosts, host_names
 
-def ping_host(host: str) -> Dict:
+def resolve(host: str) -> Optional[str]:
+    """Resolve a host to an IPv4 address, caching lookups for DNS_CACHE_TTL seconds (DNS_FAILURE_TTL when they fail)"""
+    cached = _dns_cache.get(host)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
+    
+    # IP addresses don't need a lookup and never expire
+    try:
+        ipaddress.IPv4Address(host)
+        _dns_cache[host] = (host, float('inf'))
+        return host
+    except ValueError:
+        pass
+    
+    try:
+        # Only IPv4 is pinged, so only ask for IPv4 addresses
+        ip = socket.getaddrinfo(host, None, family=socket.AF_INET)[0][4][0]
+    except (socket.gaierror, IndexError):
+        # Remember the failure too, so a bad hostname doesn't stall every cycle on the resolver
+        _dns_cache[host] = (None, time.monotonic() + DNS_FAILURE_TTL)
+        return None
+    
+    _dns_cache[host] = (ip, time.monotonic() + DNS_CACHE_TTL)
+    return ip
+
+class PingResult:
+    """Result of pinging a host, using slots to keep per-host memory and attribute lookups cheap"""
+    __slots__ = ('host', 'status', 'latency', 'timestamp', 'message', 'packet_loss')
+    
+    def __init__(self, host: str, status: str = 'unknown', latency: Optional[float] = None, message: str = '', packet_loss: float = 100.0):
+        self.host = host
+        self.status = status
+        self.latency = latency
+        self.timestamp = time.time()
+        self.message = message
+        self.packet_loss = packet_loss
+
+def store_result(host: str, result: PingResult):
+    """Store a host's latest result, moving it between the status counts"""
+    with _results_lock:
+        old = results.get(host)
+        if old is not None:
+            status_counts[old.status] -= 1
+        status_counts[result.status] += 1
+        results[host] = result
+
+def store_results(new_results: Dict[str, PingResult]):
+    """Store a batch of results"""
+    for host, result in new_results.items():
+        store_result(host, result)
+
+def remove_result(host: str):
+    """Forget a host's result, if it has one"""
+    with _results_lock:
+        old = results.pop(host, None)
+        if old is not None:
+            status_counts[old.status] -= 1
+
+def ping_command(ip: str) -> List[str]:
+    """Build the system ping command for an IP address"""
+    if sys.platform == 'darwin':  # macOS
+        return ['/sbin/ping', '-c', str(ping_count), '-W', str(int(ping_timeout * 1000)), ip]
+    elif sys.platform == 'win32':  # Windows
+        return ['ping', '-n', str(ping_count), '-w', str(int(ping_timeout * 1000)), ip]
+    else:  # Linux/Unix
+        return ['ping', '-c', str(ping_count), '-W', str(int(ping_timeout)), ip]
+
+def max_ping_duration() -> float:
+    """Return the longest a one-shot ping command should take: one second between pings plus the reply timeout and process startup"""
+    return (ping_count - 1) + ping_timeout + 1.0
+
+def find_latency(output: bytes, last: bool = False) -> Optional[float]:
+    """Return the first (or last) reply time in the system ping output, scanning the bytes directly"""
+    find = output.rfind if last else output.find
+    positions = [i for i in (find(b'time='), find(b'time<')) if i != -1]
+    if not positions:
+        return None
+    
+    return read_number(output, (max(positions) if last else min(positions)) + 5)
+
+def find_average_latency(output: bytes) -> Optional[float]:
+    """Return the average reply time from the summary at the end of the system ping output"""
+    # macOS and Linux: 'round-trip min/avg/max/stddev = 9.1/10.2/12.0/1.1 ms'
+    _, found, stats = output.rpartition(b'min/avg/max')
+    if found:
+        values = stats.partition(b'= ')[2].split(b'/')
+        return read_number(values[1], 0) if len(values) > 1 else None
+    
+    # Windows: 'Minimum = 1ms, Maximum = 14ms, Average = 7ms'
+    _, found, stats = output.rpartition(b'Average = ')
+    if found:
+        return read_number(stats, 0)
+    return None
+
+def read_number(output: bytes, start: int) -> Optional[float]:
+    """Read the number starting at a position in the system ping output"""
+    end = start
+    while end < len(output) and output[end] in _LATENCY_CHARS:
+        end += 1
+    try:
+        return float(output[start:end])
+    except ValueError:
+        return None
+
+def parse_ping_output(result: PingResult, returncode: int, stdout: bytes, stderr: bytes):
+    """Fill in a result from the output of the system ping command"""
+    if returncode == 0:
+        result.status = 'up'
+        
+        # Report the average over all replies like the ICMP socket does, or the last reply without a summary
+        result.latency = find_average_latency(stdout)
+        if result.latency is None:
+            result.latency = find_latency(stdout, last=True)
+        
+        # The packet loss is the number just before '% packet loss' (Windows doesn't print one)
+        head, found, _ = stdout.partition(b'% packet loss')
+        if found and result.latency is not None:
+            result.packet_loss = float(head.rsplit(None, 1)[-1])
+            
+            # If packet loss is 100%, status should be down
+            if result.packet_loss == 100.0:
+                result.status = 'down'
+    else:
+        result.status = 'down'
+        
+        if stderr:
+            result.message = stderr.decode(errors='replace').strip()
+        else:
+            result.message = 'Host is unreachable'
+
+def ping_host(host: str) -> PingResult:
     """Ping a single host and return results"""
-    # Initialize result dictionary
-    result = {
-        'host': host,
-        'status': 'unknown',
-        'latency': None,
-        'timestamp': datetime.now(),
-        'message': '',
-        'packet_loss': 100.0
-    }
+    result = PingResult(host)
     
     try:
         # Try to resolve the hostname first
-        try:
-            socket.gethostbyname(host)
-        except socket.gaierror:
-            result['status'] = 'error'
-            result['message'] = 'Cannot resolve hostname'
+        ip = resolve(host)
+        if ip is None:
+            result.status = 'error'
+            result.message = 'Cannot resolve hostname'
             return result
         
-        # Build the ping command
-        if sys.platform == 'darwin':  # macOS
-            cmd = ['/sbin/ping', '-c', str(ping_count), '-W', str(int(ping_timeout * 1000)), host]
-        elif sys.platform == 'win32':  # Windows
-            cmd = ['ping', '-n', str(ping_count), '-w', str(int(ping_timeout * 1000)), host]
-        else:  # Linux/Unix
-            cmd = ['ping', '-c', str(ping_count), '-W', str(int(ping_timeout)), host]
-        
-        # Execute the ping command
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        stdout, stderr = process.communicate()
-        
-        # Parse the ping output
-        if process.returncode == 0:
-            result['status'] = 'up'
-            
-            # Extract latency
-            if 'time=' in stdout or 'time<' in stdout:
-                latency_pattern = r'time[=<]([0-9.]+)'
-                latency_matches = re.findall(latency_pattern, stdout)
-                if latency_matches:
-                    result['latency'] = float(latency_matches[-1])  # Use the last match
+        # Execute the ping command (using the resolved IP so ping doesn't resolve it again)
+        process = subprocess.run(ping_command(ip), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                 timeout=max_ping_duration())
+        
+        parse_ping_output(result, process.returncode, process.stdout, process.stderr)
+    
+    except subprocess.TimeoutExpired:
+        result.status = 'down'
+        result.message = 'Ping timed out'
+    except Exception as e:
+        result.status = 'error'
+        result.message = str(e)
+    
+    return result
+
+def submit_all_pings(host_list: List[str]) -> Tuple[List[Tuple[str, subprocess.Popen]], Dict[str, PingResult]]:
+    """Start the system ping command for every host without waiting for any of them to finish"""
+    pairs = []
+    errors = {}
+    
+    for host in host_list:
+        ip = resolve(host)
+        if ip is None:
+            errors[host] = PingResult(host, status='error', message='Cannot resolve hostname')
+            continue
+        
+        try:
+            process = subprocess.Popen(ping_command(ip), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            errors[host] = PingResult(host, status='error', message=str(e))
+            continue
+        
+        pairs.append((host, process))
+    
+    return pairs, errors
+
+def collect_all(pairs: List[Tuple[str, subprocess.Popen]], deadline: float) -> Dict[str, PingResult]:
+    """Wait on the output of all running ping commands at once, killing any still running at the deadline"""
+    batch_results = {}
+    
+    with selectors.DefaultSelector() as selector:
+        for host, process in pairs:
+            selector.register(process.stdout, selectors.EVENT_READ, (host, process, []))
+        
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             
-            # Extract packet loss
-            packet_loss_pattern = r'(\d+(?:\.\d+)?)% packet loss'
-            packet_loss_match = re.search(packet_loss_pattern, stdout)
-            if packet_loss_match:
-                result['packet_loss'] = float(packet_loss_match.group(1))
+            for key, _ in selector.select(timeout=remaining):
+                host, process, chunks = key.data
+                data = os.read(key.fd, 4096)
+                if data:
+                    chunks.append(data)
+                    continue
+                
+                # End of output, the ping command has finished
+                selector.unregister(key.fileobj)
+                _, stderr = process.communicate()
                 
-                # If packet loss is 100%, status should be down
-                if result['packet_loss'] == 100.0:
-                    result['status'] = 'down'
+                result = PingResult(host)
+                parse_ping_output(result, process.returncode, b''.join(chunks), stderr)
+                batch_results[host] = result
+        
+        # Kill the stragglers
+        for key in list(selector.get_map().values()):
+            host, process, _ = key.data
+            process.kill()
+            process.communicate()
+            
+            batch_results[host] = PingResult(host, status='down', message='Ping timed out')
+    
+    return batch_results
+
+def persistent_ping_command(ip: str) -> List[str]:
+    """Build a system ping command that keeps pinging an IP address every refresh interval"""
+    interval = str(max(refresh_rate, 0.2))  # Shortest interval allowed without root
+    if sys.platform == 'darwin':  # macOS (prints "Request timeout" for missed replies)
+        return ['/sbin/ping', '-i', interval, ip]
+    else:  # Linux/Unix (-O prints "no answer yet" for missed replies)
+        return ['ping', '-O', '-i', interval, '-W', str(max(1, int(ping_timeout))), ip]
+
+def start_persistent_ping(host: str):
+    """Start a persistent ping process for a host along with a thread reading its output"""
+    ip = resolve(host)
+    if ip is None:
+        store_result(host, PingResult(host, status='error', message='Cannot resolve hostname'))
+        return
+    
+    try:
+        # Merge stderr into stdout so a ping that keeps printing errors can't fill an unread pipe and stall
+        process = subprocess.Popen(persistent_ping_command(ip), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except OSError as e:
+        store_result(host, PingResult(host, status='error', message=str(e)))
+        return
+    
+    _ping_processes[host] = process
+    threading.Thread(target=read_persistent_ping, args=(host, process), daemon=True).start()
+
+def read_persistent_ping(host: str, process: subprocess.Popen):
+    """Update a host's result from every line its persistent ping process prints"""
+    last_other = b''  # Last line that wasn't a reply or timeout, reported if the process exits
+    for line in process.stdout:
+        latency = find_latency(line)
+        if latency is not None:
+            result = PingResult(host, status='up', latency=latency, packet_loss=0.0)
+        elif b'timeout' in line or b'no answer' in line or b'Unreachable' in line:
+            result = PingResult(host, status='down', message='Host is unreachable')
+        else:
+            if line.strip():
+                last_other = line
+            continue
+        
+        # Ignore output from a process that has been replaced or stopped, checking under the lock
+        # so sync_persistent_pings can't remove the host between the check and the store
+        with _results_lock:
+            if _ping_processes.get(host) is not process:
+                break
+            store_result(host, result)
+    
+    # The ping process has exited, ping_worker restarts it on the next cycle
+    process.wait()
+    message = last_other.decode(errors='replace').strip()
+    with _results_lock:
+        if _ping_processes.get(host) is process and not stop_event.is_set():
+            store_result(host, PingResult(host, status='error', message=message or 'Ping exited'))
+
+def sync_persistent_pings(host_list: List[str]):
+    """Start persistent pings for new hosts, restart any that exited and stop those no longer monitored"""
+    host_set = set(host_list)
+    for host in list(_ping_processes):
+        if host not in host_set:
+            _ping_processes.pop(host).terminate()
+            remove_result(host)
+    
+    for host in host_list:
+        process = _ping_processes.get(host)
+        if process is None or process.poll() is not None:
+            start_persistent_ping(host)
+
+def stop_persistent_pings():
+    """Terminate all persistent ping processes"""
+    while _ping_processes:
+        _, process = _ping_processes.popitem()
+        if process.poll() is None:
+            process.terminate()
+
+def fping_command(ips: List[str]) -> List[str]:
+    """Build an fping command that keeps pinging every IP address each refresh interval"""
+    period = max(int(refresh_rate * 1000), 10)
+    timeout = min(int(ping_timeout * 1000), period)  # fping doesn't wait longer than the period
+    return [FPING, '-l', '-p', str(period), '-t', str(timeout)] + ips
+
+def sync_fping(host_list: List[str]):
+    """Start the fping process, restarting it when the hosts or their addresses change or it exits"""
+    global _fping_process, _fping_hosts
+    
+    ip_hosts: Dict[str, List[str]] = {}
+    for host in host_list:
+        ip = resolve(host)
+        if ip is None:
+            store_result(host, PingResult(host, status='error', message='Cannot resolve hostname'))
         else:
-            result['status'] = 'down'
+            ip_hosts.setdefault(ip, []).append(host)
+    
+    if _fping_process is not None and _fping_process.poll() is None and ip_hosts == _fping_hosts:
+        return
+    
+    # Drop any results the old process stored for hosts that are no longer monitored
+    stop_fping()
+    host_set = set(host_list)
+    for host_group in _fping_hosts.values():
+        for host in host_group:
+            if host not in host_set:
+                remove_result(host)
+    _fping_hosts = {}
+    if not ip_hosts:
+        return
+    
+    try:
+        process = subprocess.Popen(fping_command(list(ip_hosts)), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        for host_group in ip_hosts.values():
+            for host in host_group:
+                store_result(host, PingResult(host, status='error', message=str(e)))
+        return
+    
+    _fping_process, _fping_hosts = process, ip_hosts
+    threading.Thread(target=read_fping, args=(process, ip_hosts), daemon=True).start()
+
+def read_fping(process: subprocess.Popen, ip_hosts: Dict[str, List[str]]):
+    """Update results from every line fping prints, e.g. '8.8.8.8 : [3], 64 bytes, 12.3 ms (11.9 avg, 0% loss)'"""
+    for line in process.stdout:
+        ip, found, rest = line.partition(b' : ')
+        if not found:
+            continue
+        
+        _, found, reply = rest.partition(b' bytes, ')
+        if found:
+            try:
+                latency = float(reply.split(None, 1)[0])
+            except (IndexError, ValueError):
+                continue
+            status, message, packet_loss = 'up', '', 0.0
+        elif b'timed out' in rest:
+            latency, status, message, packet_loss = None, 'down', 'Host is unreachable', 100.0
+        else:
+            continue
+        
+        # Ignore output from a process that has been replaced or stopped, checking under the lock
+        # so sync_fping can't remove a host between the check and the store
+        with _results_lock:
+            if _fping_process is not process:
+                break
+            for host in ip_hosts.get(ip.strip().decode(), ()):
+                store_result(host, PingResult(host, status=status, latency=latency, message=message, packet_loss=packet_loss))
+    
+    # fping has exited, ping_worker restarts it on the next cycle
+    process.wait()
+    with _results_lock:
+        if _fping_process is process and not stop_event.is_set():
+            for host_group in ip_hosts.values():
+                for host in host_group:
+                    store_result(host, PingResult(host, status='error', message='fping exited'))
+
+def stop_fping():
+    """Terminate the fping process, if running"""
+    global _fping_process
+    
+    process, _fping_process = _fping_process, None
+    if process is not None and process.poll() is None:
+        process.terminate()
+
+def icmp_checksum(data: bytes) -> int:
+    """Compute the ICMP checksum (one's complement sum of 16-bit words)"""
+    if len(data) % 2:
+        data += b'\x00'
+    
+    words = array.array('H', data)
+    if sys.byteorder == 'little':
+        words.byteswap()
+    
+    total = sum(words)
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def ping_batch(host_list: List[str]) -> Dict[str, PingResult]:
+    """Ping all hosts over the shared ICMP socket, sending every request first and then waiting once for the replies"""
+    global icmp_seq
+    
+    batch_results = {}
+    pending = {}  # Sequence number -> (host, ip, send time)
+    sent = {}     # Host -> number of echo requests sent
+    rtts = {}     # Host -> list of round trip times in ms
+    
+    # Resolve every host before sending anything, so a slow lookup can't add to the round trip
+    # times of the hosts already sent to
+    targets = []
+    for host in host_list:
+        result = PingResult(host)
+        batch_results[host] = result
+        
+        ip = resolve(host)
+        if ip is None:
+            result.status = 'error'
+            result.message = 'Cannot resolve hostname'
+            continue
+        targets.append((host, ip))
+    
+    def read_replies():
+        """Record every reply that has already arrived"""
+        while True:
+            try:
+                data, addr = icmp_sock.recvfrom(2048)
+            except OSError:
+                # Nothing left to read
+                return
+            recv_time = time.monotonic()
             
-            if stderr:
-                result['message'] = stderr.strip()
-            else:
-                result['message'] = 'Host is unreachable'
-                
-    except Exception as e:
-        result['status'] = 'error'
-        result['message'] = str(e)
+            # Raw sockets (and datagram sockets on macOS) include the IP header
+            offset = (data[0] & 0x0F) * 4 if data and data[0] >> 4 == 4 else 0
+            if len(data) < offset + 8:
+                continue
+            
+            icmp_type, _, _, ident, seq = struct.unpack_from('!BBHHH', data, offset)
+            if icmp_type != ICMP_ECHO_REPLY or seq not in pending:
+                continue
+            
+            # Linux rewrites the identifier on datagram sockets and only delivers their own replies,
+            # elsewhere (macOS) every echo reply on the machine arrives here, so check it there
+            if (icmp_raw or sys.platform != 'linux') and ident != icmp_ident:
+                continue
+            
+            host, ip, send_time = pending[seq]
+            if addr[0] != ip:
+                continue
+            
+            del pending[seq]
+            rtts[host].append((recv_time - send_time) * 1000)
     
-    return result
+    # Send all echo requests back-to-back
+    for host, ip in targets:
+        result = batch_results[host]
+        sent[host] = 0
+        rtts[host] = []
+        for _ in range(ping_count):
+            icmp_seq = (icmp_seq + 1) & 0xFFFF
+            checksum = icmp_checksum(struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, icmp_ident, icmp_seq) + ICMP_PAYLOAD)
+            packet = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, icmp_ident, icmp_seq) + ICMP_PAYLOAD
+            
+            try:
+                icmp_sock.sendto(packet, (ip, 0))
+            except OSError as e:
+                result.status = 'error'
+                result.message = str(e)
+                break
+            
+            pending[icmp_seq] = (host, ip, time.monotonic())
+            sent[host] += 1
+        
+        # Pick up replies that are already waiting, so the remaining sends don't delay their arrival times
+        read_replies()
+    
+    # Wait for the rest of the replies until the timeout expires
+    deadline = time.monotonic() + ping_timeout
+    with selectors.DefaultSelector() as selector:
+        selector.register(icmp_sock, selectors.EVENT_READ)
+        
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(timeout=remaining):
+                break
+            read_replies()
+    
+    # Fill in the results from the replies received
+    for host, host_rtts in rtts.items():
+        result = batch_results[host]
+        if result.status == 'error' or not sent[host]:
+            continue
+        
+        result.packet_loss = round(100.0 * (sent[host] - len(host_rtts)) / sent[host], 1)
+        if host_rtts:
+            result.status = 'up'
+            result.latency = sum(host_rtts) / len(host_rtts)
+        else:
+            result.status = 'down'
+            result.message = 'Host is unreachable'
+    
+    return batch_results
+
+def cycle_completed():
+    """Record that a ping cycle has finished and wake the display loop"""
+    global _cycle_count
+    with new_cycle:
+        _cycle_count += 1
+        new_cycle.notify_all()
+
+def wait_for_cycle(seen: int, timeout: Optional[float] = None) -> int:
+    """Wait for a ping cycle after the one seen to finish, or the timeout to pass, and return the latest cycle"""
+    # A cycle takes the refresh interval, or longer while pings time out, so by default only give up
+    # waiting (and redraw anyway) if it runs past both
+    if timeout is None:
+        timeout = refresh_rate + max_ping_duration()
+    with new_cycle:
+        new_cycle.wait_for(lambda: _cycle_count != seen or stop_event.is_set(), timeout=timeout)
+        return _cycle_count
 
 def ping_worker(host_list: List[str]):
     """Worker function to ping hosts continuously"""
-    global results, running, hosts
+    global results, hosts
+    
+    # Windows can't wait on pipes with selectors, so without the ICMP socket run the ping commands in a thread pool there
+    executor = None
+    if not icmp_sock and sys.platform == 'win32':
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(64, len(host_list) or 1))
     
-    while running:
+    # Otherwise keep a single fping process, or failing that one ping process per host, running
+    # instead of starting new ones every cycle, unless a ping count was requested, which needs
+    # the one-shot ping commands
+    continuous = not icmp_sock and not executor and ping_count == 1
+    fping = continuous and FPING is not None
+    persistent = continuous and not fping
+    if fping:
+        atexit.register(stop_fping)
+    if persistent:
+        atexit.register(stop_persistent_pings)
+    
+    while not stop_event.is_set():
+        cycle_start = time.monotonic()
+        
         # Check for file changes first
-        check_file_changes()
+        if file_watcher_active:
+            if devices_file_changed.is_set():
+                devices_file_changed.clear()
+                reload_devices_file()
+        else:
+            check_file_changes()
         
         # Use current hosts list (may have been updated by check_file_changes)
         current_hosts = hosts if hosts else host_list
         
-        for host in current_hosts:
-            if not running:
-                break
-            
-            result = ping_host(host)
-            results[host] = result
+        if icmp_sock:
+            # Ping every host in a single batch over the shared ICMP socket
+            store_results(ping_batch(current_hosts))
+        elif fping:
+            # fping updates the results as replies come in
+            sync_fping(current_hosts)
+        elif persistent:
+            # The persistent ping processes update the results as replies come in
+            sync_persistent_pings(current_hosts)
+        elif executor:
+            # Store each result as soon as its ping finishes rather than in host order
+            futures = {executor.submit(ping_host, host): host for host in current_hosts}
+            for future in concurrent.futures.as_completed(futures):
+                if stop_event.is_set():
+                    break
+                store_result(futures[future], future.result())
+        else:
+            # Start every ping command first, then wait on all of their output at once
+            pairs, errors = submit_all_pings(current_hosts)
+            store_results(errors)
             
-        # Small sleep to prevent CPU overuse in case of very fast cycles
-        time.sleep(0.1)
+            deadline = time.monotonic() + max_ping_duration()
+            store_results(collect_all(pairs, deadline))
+        
+        cycle_completed()
+        
+        # Wait out the rest of the refresh interval before the next cycle
+        elapsed = time.monotonic() - cycle_start
+        sleep_for = max(0.0, refresh_rate - elapsed)
+        if sleep_for:
+            stop_event.wait(sleep_for)
+    
+    if executor:
+        executor.shutdown(wait=False, cancel_futures=True)
+    if fping:
+        stop_fping()
+    if persistent:
+        stop_persistent_pings()
 
 def status_color(status: str) -> str:
     """Return color code based on status"""
@@ -268,6 +916,12 @@ def status_color(status: str) -> str:
     else:
         return Fore.WHITE
 
+# Colored status text for the detailed view, built once instead of for every host on every refresh
+DETAIL_STATUS_TOKENS = {
+    status: f"{status_color(status)}{status.upper()}{Style.RESET_ALL}".ljust(6)
+    for status in ('up', 'down', 'error', 'unknown')
+}
+
 def format_latency(latency: Optional[float]) -> str:
     """Format latency value for display"""
     if latency is None:
@@ -278,104 +932,103 @@ def format_latency(latency: Optional[float]) -> str:
     else:
         return f"{latency:.1f} ms"
 
+# Cached display timestamp, formatted at most once per second
+_last_ts_sec = 0
+_last_ts_str = ""
+
+def _hms_now() -> str:
+    """Return the current time as HH:MM:SS"""
+    global _last_ts_sec, _last_ts_str
+    
+    now = int(time.time())
+    if now != _last_ts_sec:
+        _last_ts_sec = now
+        _last_ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+    return _last_ts_str
+
 def display_results_simple():
     """Display results in simple format with minimal output"""
     # Only print a summary line instead of full table
     if results:
-        up_count = sum(1 for r in results.values() if r['status'] == 'up')
-        down_count = sum(1 for r in results.values() if r['status'] == 'down')
-        error_count = sum(1 for r in results.values() if r['status'] == 'error')
+        up_count, down_count, error_count = status_counts['up'], status_counts['down'], status_counts['error']
         
         # Create a compact status line
-        status_line = f"[{datetime.now().strftime('%H:%M:%S')}] "
+        status_line = f"[{_hms_now()}] "
         status_line += f"{Fore.GREEN}UP:{up_count}{Style.RESET_ALL} "
         status_line += f"{Fore.RED}DOWN:{down_count}{Style.RESET_ALL} "
         status_line += f"{Fore.YELLOW}ERROR:{error_count}{Style.RESET_ALL}"
         
         # Add device status indicators
         device_status = []
-        sorted_hosts = sorted(hosts, key=ip_to_int)
+        sorted_hosts = get_sorted_hosts()
         for host in sorted_hosts[:5]:  # Only show first 5 devices
             name = host_names.get(host, host)
-            if host in results:
-                status = results[host]['status']
-                if status == 'up':
-                    device_status.append(f"{name}:{Fore.GREEN}✓{Style.RESET_ALL}")
-                elif status == 'down':
-                    device_status.append(f"{name}:{Fore.RED}✗{Style.RESET_ALL}")
-                else:
-                    device_status.append(f"{name}:{Fore.YELLOW}?{Style.RESET_ALL}")
+            result = results.get(host)
+            if result is not None:
+                device_status.append(f"{name}:{CHECK_TOKENS[result.status]}")
         
         if device_status:
             status_line += f" | {' '.join(device_status)}"
         
-        print(status_line)
+        sys.stdout.write(status_line + "\n")
         sys.stdout.flush()
 
 def display_results_detailed():
     """Display results in detailed format with compact output"""
     # Print detailed status for each host in compact format
     if results:
-        up_count = sum(1 for r in results.values() if r['status'] == 'up')
-        down_count = sum(1 for r in results.values() if r['status'] == 'down')
-        error_count = sum(1 for r in results.values() if r['status'] == 'error')
+        up_count, down_count, error_count = status_counts['up'], status_counts['down'], status_counts['error']
         
-        # Print summary first
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] {Fore.GREEN}UP:{up_count}{Style.RESET_ALL} {Fore.RED}DOWN:{down_count}{Style.RESET_ALL} {Fore.YELLOW}ERROR:{error_count}{Style.RESET_ALL}")
+        # Build the whole frame and write it at once so it can't be torn mid-frame
+        # Summary first
+        lines = [f"[{_hms_now()}] {Fore.GREEN}UP:{up_count}{Style.RESET_ALL} {Fore.RED}DOWN:{down_count}{Style.RESET_ALL} {Fore.YELLOW}ERROR:{error_count}{Style.RESET_ALL}"]
         
-        # Print device details in compact format
-        sorted_hosts = sorted(hosts, key=ip_to_int)
+        # Device details in compact format
+        sorted_hosts = get_sorted_hosts()
         for host in sorted_hosts:
             name = host_names.get(host, host)
             
-            if host in results:
-                result = results[host]
-                status = result['status']
-                latency = result['latency']
-                packet_loss = result['packet_loss']
+            result = results.get(host)
+            if result is not None:
+                status = result.status
+                latency = result.latency
+                packet_loss = result.packet_loss
                 
-                status_str = f"{status_color(status)}{status.upper()}{Style.RESET_ALL}"
                 latency_str = format_latency(latency)
                 packet_loss_str = f"{packet_loss}%" if packet_loss is not None else "N/A"
                 
-                print(f"  {name:<15} {host:<15} {status_str:<6} {latency_str:<8} {packet_loss_str}")
+                lines.append(f"  {name:<15} {host:<15} {DETAIL_STATUS_TOKENS[status]} {latency_str:<8} {packet_loss_str}")
             else:
-                print(f"  {name:<15} {host:<15} {'WAITING':<6} {'N/A':<8} {'N/A'}")
+                lines.append(f"  {name:<15} {host:<15} {'WAITING':<6} {'N/A':<8} {'N/A'}")
         
-        print()  # Empty line for readability
+        lines.append("")  # Empty line for readability
+        sys.stdout.write("\n".join(lines) + "\n")
         sys.stdout.flush()
 
 def display_results_compact():
     """Display results in ultra-compact format to minimize scrolling"""
     if results:
-        up_count = sum(1 for r in results.values() if r['status'] == 'up')
-        down_count = sum(1 for r in results.values() if r['status'] == 'down')
-        error_count = sum(1 for r in results.values() if r['status'] == 'error')
+        up_count, down_count, error_count = status_counts['up'], status_counts['down'], status_counts['error']
         
         # Ultra-compact single line with just counts and key devices
-        line = f"[{datetime.now().strftime('%H:%M:%S')}] "
+        line = f"[{_hms_now()}] "
         line += f"{Fore.GREEN}{up_count}✓{Style.RESET_ALL} "
         line += f"{Fore.RED}{down_count}✗{Style.RESET_ALL} "
         line += f"{Fore.YELLOW}{error_count}?{Style.RESET_ALL}"
         
         # Add just the first few device statuses
         device_status = []
-        sorted_hosts = sorted(hosts, key=ip_to_int)
+        sorted_hosts = get_sorted_hosts()
         for host in sorted_hosts[:3]:  # Only first 3 devices
             name = host_names.get(host, host)[:8]  # Truncate long names
-            if host in results:
-                status = results[host]['status']
-                if status == 'up':
-                    device_status.append(f"{name}:{Fore.GREEN}✓{Style.RESET_ALL}")
-                elif status == 'down':
-                    device_status.append(f"{name}:{Fore.RED}✗{Style.RESET_ALL}")
-                else:
-                    device_status.append(f"{name}:{Fore.YELLOW}?{Style.RESET_ALL}")
+            result = results.get(host)
+            if result is not None:
+                device_status.append(f"{name}:{CHECK_TOKENS[result.status]}")
         
         if device_status:
             line += f" {' '.join(device_status)}"
         
-        print(line)
+        sys.stdout.write(line + "\n")
         sys.stdout.flush()
 
 # Global variables for live display
@@ -383,10 +1036,11 @@ _live_header_printed = False
 _last_display_time = 0
 _display_counter = 0
 _device_lines = []
+_device_states = []  # (host, name, status, latency, packet loss) each device line was last drawn from
 
 def display_results_live():
     """Display results in a truly live-updating format that updates in place"""
-    global _live_header_printed, _last_display_time, _display_counter, _device_lines
+    global _live_header_printed, _last_display_time, _display_counter, _device_lines, _device_states
     
     current_time = time.time()
     
@@ -399,16 +1053,16 @@ def display_results_live():
         print("="*80)
         
         # Initialize device lines
-        sorted_hosts = sorted(hosts, key=ip_to_int)
+        sorted_hosts = get_sorted_hosts()
         _device_lines = []
+        _device_states = []
         for i, host in enumerate(sorted_hosts):
-            name = host_names.get(host, host)
-            if len(name) > 14:
-                name = name[:11] + "..."
+            name = _display_names.get(host, host)
             
             # Create initial line with waiting status
             line = f"{name:<15} {host:<18} {'WAITING':<8} {'N/A':<10} {'N/A':<12}"
             _device_lines.append(line)
+            _device_states.append((host, name))
             print(line)
         
         # Add summary line
@@ -426,29 +1080,34 @@ def display_results_live():
     _last_display_time = current_time
     _display_counter += 1
     
-    # Update device lines in place using carriage return
+    # Update device lines in place using cursor movement
     if results:
-        sorted_hosts = sorted(hosts, key=ip_to_int)
+        sorted_hosts = get_sorted_hosts()
         
         # Move cursor up to first device line
         lines_to_move_up = len(_device_lines) + 2  # +2 for separator and summary
-        print(f"\033[{lines_to_move_up}A", end="")
+        output = [f"\033[{lines_to_move_up}A"]
+        lines_to_skip = 0
         
         # Update each device line
         for i, host in enumerate(sorted_hosts):
             if i < len(_device_lines):
-                name = host_names.get(host, host)
-                if len(name) > 14:
-                    name = name[:11] + "..."
+                # Skip formatting rows whose name and result haven't changed, moving the cursor down past them
+                name = _display_names.get(host, host)
+                result = results.get(host)
+                state = (host, name, result.status, result.latency, result.packet_loss) if result is not None else (host, name)
+                if state == _device_states[i]:
+                    lines_to_skip += 1
+                    continue
+                _device_states[i] = state
                 
-                if host in results:
-                    result = results[host]
-                    status = result['status']
-                    latency = result['latency']
-                    packet_loss = result['packet_loss']
+                if result is not None:
+                    status = result.status
+                    latency = result.latency
+                    packet_loss = result.packet_loss
                     
                     # Format latency
-                    if latency is not None and latency > 0:
+                    if latency is not None:
                         if latency < 1:
                             latency_str = "<1 ms"
                         else:
@@ -459,39 +1118,36 @@ def display_results_live():
                     # Format packet loss
                     packet_loss_str = f"{packet_loss}%" if packet_loss is not None else "N/A"
                     
-                    # Color coding for status
-                    if status == 'up':
-                        status_color = Fore.GREEN
-                        status_display = "UP"
-                    elif status == 'down':
-                        status_color = Fore.RED
-                        status_display = "DOWN"
-                    else:
-                        status_color = Fore.YELLOW
-                        status_display = "ERROR"
-                    
                     # Create updated line
-                    line = f"{name:<15} {host:<18} {status_color}{status_display:<8}{Style.RESET_ALL} {latency_str:<10} {packet_loss_str:<12}"
+                    line = f"{name:<15} {host:<18} {STATUS_TOKENS[status]} {latency_str:<10} {packet_loss_str:<12}"
                 else:
                     # No result yet
                     line = f"{name:<15} {host:<18} {'WAITING':<8} {'N/A':<10} {'N/A':<12}"
                 
+                # A new result can still format to the same line
+                if line == _device_lines[i]:
+                    lines_to_skip += 1
+                    continue
+                if lines_to_skip:
+                    output.append(f"\033[{lines_to_skip}B")
+                    lines_to_skip = 0
+                
                 # Clear the line and print new content
-                print("\033[K", end="")  # Clear line
-                print(line)
+                output.append(f"\r\033[K{line}\n")
                 _device_lines[i] = line
         
         # Update summary line
-        up_count = sum(1 for r in results.values() if r['status'] == 'up')
-        down_count = sum(1 for r in results.values() if r['status'] == 'down')
-        error_count = sum(1 for r in results.values() if r['status'] == 'error')
+        up_count, down_count, error_count = status_counts['up'], status_counts['down'], status_counts['error']
         
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _hms_now()
         summary = f"Last Update: {timestamp} | UP:{up_count} DOWN:{down_count} ERR:{error_count}"
         
-        print("-" * 80)
-        print("\033[K", end="")  # Clear line
-        print(summary)
+        # Skip any remaining device lines and the separator, then rewrite the summary
+        lines_to_skip += len(_device_lines) - min(len(sorted_hosts), len(_device_lines)) + 1
+        output.append(f"\033[{lines_to_skip}B\r\033[K{summary}\n")
+        
+        # Write the whole frame at once
+        sys.stdout.write(''.join(output))
     
     sys.stdout.flush()
 
@@ -510,8 +1166,8 @@ def display_results_curses():
     
     with curses_lock:
         try:
-            # Clear the screen
-            stdscr.clear()
+            # Clear the buffer (unlike clear(), erase() doesn't force a full repaint)
+            stdscr.erase()
             
             # Get screen dimensions
             max_y, max_x = stdscr.getmaxyx()
@@ -522,16 +1178,14 @@ def display_results_curses():
             
             # Header line with summary
             if results:
-                up_count = sum(1 for r in results.values() if r['status'] == 'up')
-                down_count = sum(1 for r in results.values() if r['status'] == 'down')
-                error_count = sum(1 for r in results.values() if r['status'] == 'error')
+                up_count, down_count, error_count = status_counts['up'], status_counts['down'], status_counts['error']
                 
                 # Create colored summary
                 summary = f"UP: {up_count}  DOWN: {down_count}  ERROR: {error_count}  |  Monitoring {len(hosts)} hosts"
                 stdscr.addstr(1, 0, summary)
                 
                 # Timestamp
-                current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                current_time = time.strftime("%Y-%m-%d %H:%M:%S")
                 time_str = f"Last Update: {current_time}"
                 stdscr.addstr(1, max_x - len(time_str) - 1, time_str)
             else:
@@ -547,24 +1201,21 @@ def display_results_curses():
             
             # Device rows
             row = 5
-            sorted_hosts = sorted(hosts, key=ip_to_int)
+            sorted_hosts = get_sorted_hosts()
             
             for host in sorted_hosts:
                 if row >= max_y - 2:  # Leave space for bottom info
                     break
                     
-                name = host_names.get(host, host)
-                if len(name) > 14:
-                    name = name[:11] + "..."
+                name = _display_names.get(host, host)
                 
-                if host in results:
-                    result = results[host]
-                    status = result['status']
-                    latency = result['latency']
-                    packet_loss = result['packet_loss']
+                result = results.get(host)
+                if result is not None:
+                    latency = result.latency
+                    packet_loss = result.packet_loss
                     
                     # Format latency
-                    if latency is not None and latency > 0:
+                    if latency is not None:
                         if latency < 1:
                             latency_str = "<1 ms"
                         else:
@@ -576,36 +1227,27 @@ def display_results_curses():
                     packet_loss_str = f"{packet_loss}%" if packet_loss is not None else "N/A"
                     
                     # Color coding for status
-                    if status == 'up':
-                        status_color = curses.color_pair(1)  # Green
-                        status_display = "UP"
-                    elif status == 'down':
-                        status_color = curses.color_pair(2)  # Red
-                        status_display = "DOWN"
-                    else:
-                        status_color = curses.color_pair(3)  # Yellow
-                        status_display = "ERROR"
+                    status_display, status_color = _curses_status.get(result.status, _curses_status['error'])
                     
                     # Create row
-                    row_text = f"{name:<15} {host:<18} {status_display:<8} {latency_str:<10} {packet_loss_str:<12}"
+                    row_text = _row_fmt(name=name, host=host, status=status_display, lat=latency_str, loss=packet_loss_str)
                     
                     # Truncate if too long for screen
-                    if len(row_text) > max_x - 1:
-                        row_text = row_text[:max_x - 4] + "..."
+                    if len(row_text) > _row_width:
+                        row_text = row_text[:_row_width - 3] + "..."
                     
-                    stdscr.addstr(row, 0, row_text)
-                    
-                    # Color the status part
-                    status_start = 34  # Position of status in the row
+                    # Write the row once, coloring just the status part
+                    status_start = 35  # Position of status in the row (after the name and host columns)
                     status_end = status_start + len(status_display)
-                    if status_end <= max_x:
-                        stdscr.addstr(row, status_start, status_display, status_color)
+                    stdscr.addstr(row, 0, row_text[:status_start])
+                    stdscr.addstr(row_text[status_start:status_end], status_color)
+                    stdscr.addstr(row_text[status_end:])
                     
                 else:
                     # No result yet
-                    row_text = f"{name:<15} {host:<18} {'WAITING':<8} {'N/A':<10} {'N/A':<12}"
-                    if len(row_text) > max_x - 1:
-                        row_text = row_text[:max_x - 4] + "..."
+                    row_text = _row_fmt(name=name, host=host, status='WAITING', lat='N/A', loss='N/A')
+                    if len(row_text) > _row_width:
+                        row_text = row_text[:_row_width - 3] + "..."
                     stdscr.addstr(row, 0, row_text)
                 
                 row += 1
@@ -615,8 +1257,9 @@ def display_results_curses():
                 bottom_text = "Press 'q' to quit, 'r' to refresh, 's' to show stats"
                 stdscr.addstr(max_y - 1, 0, bottom_text)
             
-            # Refresh the screen
-            stdscr.refresh()
+            # Send only the changed cells to the terminal in one update
+            stdscr.noutrefresh()
+            curses.doupdate()
             
         except curses.error:
             # Handle curses errors gracefully
@@ -624,7 +1267,7 @@ def display_results_curses():
 
 def init_curses():
     """Initialize curses colors"""
-    global stdscr
+    global stdscr, _curses_status
     
     if stdscr:
         # Define color pairs
@@ -632,10 +1275,27 @@ def init_curses():
         curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)      # Red for DOWN
         curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)   # Yellow for ERROR
         curses.init_pair(4, curses.COLOR_CYAN, curses.COLOR_BLACK)     # Cyan for headers
+        
+        # Status text and color for each status
+        _curses_status = {
+            'up': ("UP", curses.color_pair(1)),
+            'down': ("DOWN", curses.color_pair(2)),
+            'error': ("ERROR", curses.color_pair(3))
+        }
+        
+        build_row_formatter()
+
+def build_row_formatter():
+    """Build the device row formatter for the current screen width"""
+    global _row_fmt, _row_width
+    
+    _, max_x = stdscr.getmaxyx()
+    _row_fmt = ("{name:<%d} {host:<18} {status:<8} {lat:<10} {loss:<12}" % NAME_WIDTH).format
+    _row_width = max_x - 1
 
 def curses_main(screen):
     """Main function wrapped by curses"""
-    global stdscr, hosts, host_names, results, running, refresh_rate, ping_timeout, show_timestamp, display_mode, ping_count, devices_file, last_file_mtime
+    global stdscr, hosts, host_names, results, refresh_rate, ping_timeout, show_timestamp, display_mode, ping_count, devices_file, last_file_mtime_ns, file_watcher_active
     
     stdscr = screen
     stdscr.nodelay(True)  # Make getch() non-blocking
@@ -660,9 +1320,12 @@ def curses_main(screen):
         
         # Initialize file modification time
         try:
-            last_file_mtime = os.path.getmtime(devices_file)
+            last_file_mtime_ns = os.stat(devices_file).st_mtime_ns
         except OSError:
-            last_file_mtime = 0
+            last_file_mtime_ns = 0
+        
+        # Prefer being notified of changes over checking the file every cycle
+        file_watcher_active = start_file_watcher()
     elif args.hosts:
         hosts = args.hosts
         
@@ -674,6 +1337,7 @@ def curses_main(screen):
     
     # Remove duplicates while preserving order
     hosts = list(dict.fromkeys(hosts))
+    hosts_changed()
     
     if not hosts:
         stdscr.addstr(0, 0, "Error: No hosts to monitor")
@@ -689,11 +1353,14 @@ def curses_main(screen):
     worker.start()
     
     try:
-        while running:
+        cycle = 0
+        drawn_cycle = -1
+        while not stop_event.is_set():
             # Handle keyboard input
             try:
                 key = stdscr.getch()
                 if key == ord('q') or key == ord('Q'):
+                    stop_event.set()
                     break
                 elif key == ord('r') or key == ord('R'):
                     # Force refresh
@@ -703,18 +1370,21 @@ def curses_main(screen):
                     pass
                 elif key == curses.KEY_RESIZE:
                     # Handle window resize
+                    build_row_formatter()
                     display_results_curses()
             except curses.error:
                 pass  # No input available
             
-            # Display results
-            display_results_curses()
+            # Display results once per ping cycle
+            if cycle != drawn_cycle:
+                display_results_curses()
+                drawn_cycle = cycle
             
-            # Wait for refresh interval
-            time.sleep(refresh_rate)
+            # Wait for the next ping cycle, but only briefly so keys are still handled promptly
+            cycle = wait_for_cycle(cycle, timeout=min(refresh_rate, KEY_POLL_INTERVAL))
     except KeyboardInterrupt:
         # Handle Ctrl+C
-        running = False
+        stop_event.set()
     
     # Cleanup
     stdscr.clear()
@@ -726,13 +1396,15 @@ def curses_main(screen):
 
 def sigint_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
-    global running
     print("\nStopping MultiPing...")
-    running = False
-    sys.exit(0)
+    stop_event.set()
+    
+    # Wake the display loop so it sees the stop right away
+    with new_cycle:
+        new_cycle.notify_all()
 
 def main():
-    global hosts, host_names, results, running, refresh_rate, ping_timeout, show_timestamp, display_mode, ping_count
+    global hosts, host_names, results, refresh_rate, ping_timeout, show_timestamp, display_mode, ping_count, devices_file, last_file_mtime_ns, file_watcher_active
     
     # Parse command line arguments
     args = parse_arguments()
@@ -757,7 +1429,10 @@ def main():
             print("This usually happens when running in a non-terminal environment.")
             display_mode = 'live'  # Fallback to live mode
         except KeyboardInterrupt:
-            running = False
+            stop_event.set()
+            return
+        else:
+            # curses_main ran the whole session, don't fall through and start it again in another mode
             return
     
     # Get list of hosts and their names
@@ -768,9 +1443,12 @@ def main():
         
         # Initialize file modification time
         try:
-            last_file_mtime = os.path.getmtime(devices_file)
+            last_file_mtime_ns = os.stat(devices_file).st_mtime_ns
         except OSError:
-            last_file_mtime = 0
+            last_file_mtime_ns = 0
+        
+        # Prefer being notified of changes over checking the file every cycle
+        file_watcher_active = start_file_watcher()
     elif args.hosts:
         hosts = args.hosts
         
@@ -782,6 +1460,7 @@ def main():
     
     # Remove duplicates while preserving order
     hosts = list(dict.fromkeys(hosts))
+    hosts_changed()
     
     # Register signal handler for Ctrl+C
     signal.signal(signal.SIGINT, sigint_handler)
@@ -791,7 +1470,8 @@ def main():
     worker.start()
     
     try:
-        while running:
+        cycle = 0
+        while not stop_event.is_set():
             # Display results based on selected mode
             if display_mode == 'simple':
                 display_results_simple()
@@ -802,11 +1482,11 @@ def main():
             elif display_mode == 'live':
                 display_results_live()
             
-            # Wait for refresh interval
-            time.sleep(refresh_rate)
+            # Wait for the next ping cycle (returns early when stopping)
+            cycle = wait_for_cycle(cycle)
     except KeyboardInterrupt:
         # Handle Ctrl+C
-        running = False
+        stop_event.set()
         print("\nStopping MultiPing...")
     
     # Wait for worker thread to terminate